@@ -10,6 +10,7 @@ Or in Django shell:
 """
 
 from django.contrib.auth.models import User
+from django.db import models, transaction
 from expenses.models import Category, Group, Expense
 from decimal import Decimal
 from datetime import datetime, timedelta
@@ -34,159 +35,179 @@ if created:
 else:
     print(f"ℹ️  Using existing user: {user.username}")
 
-# Create Categories with Material Icons
-categories_data = [
-    ('Groceries', 'shopping_cart'),
-    ('Dining Out', 'restaurant'),
-    ('Transportation', 'directions_car'),
-    ('Gas & Fuel', 'local_gas_station'),
-    ('Entertainment', 'movie'),
-    ('Health & Fitness', 'fitness_center'),
-    ('Utilities', 'electric_bolt'),
-    ('Shopping', 'shopping_bag'),
-    ('Travel', 'flight'),
-    ('Coffee & Tea', 'local_cafe'),
-]
-
-print("\n📁 Creating Categories...")
-categories = {}
-for name, icon in categories_data:
-    cat, created = Category.objects.get_or_create(
-        name=name,
-        user=user,
-        defaults={'icon_name': icon}
+# Create all demo rows in a single transaction (one commit instead of one per row)
+with transaction.atomic():
+    # Create Categories with Material Icons
+    categories_data = [
+        ('Groceries', 'shopping_cart'),
+        ('Dining Out', 'restaurant'),
+        ('Transportation', 'directions_car'),
+        ('Gas & Fuel', 'local_gas_station'),
+        ('Entertainment', 'movie'),
+        ('Health & Fitness', 'fitness_center'),
+        ('Utilities', 'electric_bolt'),
+        ('Shopping', 'shopping_bag'),
+        ('Travel', 'flight'),
+        ('Coffee & Tea', 'local_cafe'),
+    ]
+
+    print("\n📁 Creating Categories...")
+    existing_categories = set(
+        Category.objects.filter(user=user).values_list('name', flat=True)
     )
-    categories[name] = cat
-    status = "✅ Created" if created else "ℹ️  Exists"
-    print(f"   {status}: {name} ({icon})")
-
-# Create Groups
-print("\n👥 Creating Groups...")
-group_data = [
-    ('Weekend Trip', 'Annual camping trip with friends'),
-    ('Office Team', 'Team lunch and activities'),
-    ('Roommates', 'Shared apartment expenses'),
-]
-
-groups = {}
-for name, desc in group_data:
-    group, created = Group.objects.get_or_create(
-        name=name,
-        created_by=user,
-        defaults={'description': desc}
+    Category.objects.bulk_create(
+        [
+            Category(name=name, icon_name=icon, user=user)
+            for name, icon in categories_data
+            if name not in existing_categories
+        ],
+        ignore_conflicts=True
     )
-    if created:
-        group.members.add(user)
-    groups[name] = group
-    status = "✅ Created" if created else "ℹ️  Exists"
-    print(f"   {status}: {name}")
-
-# Create Sample Expenses
-print("\n💰 Creating Expenses...")
-expenses_data = [
-    # Personal expenses
-    {
-        'description': 'Weekly grocery shopping',
-        'amount': Decimal('125.50'),
-        'days_ago': 2,
-        'category': 'Groceries',
-        'group': None,
-        'is_ai': False
-    },
-    {
-        'description': 'Gas for car',
-        'amount': Decimal('45.00'),
-        'days_ago': 3,
-        'category': 'Gas & Fuel',
-        'group': None,
-        'is_ai': True
-    },
-    {
-        'description': 'Lunch at Italian restaurant',
-        'amount': Decimal('32.75'),
-        'days_ago': 1,
-        'category': 'Dining Out',
-        'group': None,
-        'is_ai': True
-    },
-    {
-        'description': 'Movie tickets',
-        'amount': Decimal('28.00'),
-        'days_ago': 5,
-        'category': 'Entertainment',
-        'group': None,
-        'is_ai': False
-    },
-    {
-        'description': 'Morning coffee',
-        'amount': Decimal('5.50'),
-        'days_ago': 0,
-        'category': 'Coffee & Tea',
-        'group': None,
-        'is_ai': True
-    },
-    
-    # Group expenses
-    {
-        'description': 'Tent for camping',
-        'amount': Decimal('299.99'),
-        'days_ago': 7,
-        'category': 'Shopping',
-        'group': 'Weekend Trip',
-        'is_ai': True
-    },
-    {
-        'description': 'Campsite reservation',
-        'amount': Decimal('75.00'),
-        'days_ago': 10,
-        'category': 'Travel',
-        'group': 'Weekend Trip',
-        'is_ai': False
-    },
-    {
-        'description': 'Team lunch buffet',
-        'amount': Decimal('180.00'),
-        'days_ago': 4,
-        'category': 'Dining Out',
-        'group': 'Office Team',
-        'is_ai': True
-    },
-    {
-        'description': 'Electricity bill',
-        'amount': Decimal('95.00'),
-        'days_ago': 15,
-        'category': 'Utilities',
-        'group': 'Roommates',
-        'is_ai': False
-    },
-    {
-        'description': 'Gym membership',
-        'amount': Decimal('49.99'),
-        'days_ago': 8,
-        'category': 'Health & Fitness',
-        'group': None,
-        'is_ai': False
-    },
-]
-
-expense_count = 0
-for exp_data in expenses_data:
-    date = datetime.now().date() - timedelta(days=exp_data['days_ago'])
-    
-    expense, created = Expense.objects.get_or_create(
-        description=exp_data['description'],
-        paid_by=user,
-        defaults={
-            'amount': exp_data['amount'],
-            'date': date,
-            'category': categories.get(exp_data['category']),
-            'group': groups.get(exp_data['group']) if exp_data['group'] else None,
-            'is_ai_generated': exp_data['is_ai']
-        }
+    categories = {cat.name: cat for cat in Category.objects.filter(user=user)}
+    for name, icon in categories_data:
+        status = "ℹ️  Exists" if name in existing_categories else "✅ Created"
+        print(f"   {status}: {name} ({icon})")
+
+    # Create Groups
+    print("\n👥 Creating Groups...")
+    group_data = [
+        ('Weekend Trip', 'Annual camping trip with friends'),
+        ('Office Team', 'Team lunch and activities'),
+        ('Roommates', 'Shared apartment expenses'),
+    ]
+
+    existing_groups = set(
+        Group.objects.filter(created_by=user).values_list('name', flat=True)
     )
+    new_group_names = [name for name, _ in group_data if name not in existing_groups]
+    Group.objects.bulk_create([
+        Group(name=name, description=desc, created_by=user)
+        for name, desc in group_data
+        if name not in existing_groups
+    ])
+    groups = {group.name: group for group in Group.objects.filter(created_by=user)}
+
+    # Add the demo user to newly created groups in a single M2M insert
+    Group.members.through.objects.bulk_create([
+        Group.members.through(group_id=groups[name].pk, user_id=user.pk)
+        for name in new_group_names
+    ], ignore_conflicts=True)
+
+    for name, _ in group_data:
+        status = "ℹ️  Exists" if name in existing_groups else "✅ Created"
+        print(f"   {status}: {name}")
+
+    # Create Sample Expenses
+    print("\n💰 Creating Expenses...")
+    expenses_data = [
+        # Personal expenses
+        {
+            'description': 'Weekly grocery shopping',
+            'amount': Decimal('125.50'),
+            'days_ago': 2,
+            'category': 'Groceries',
+            'group': None,
+            'is_ai': False
+        },
+        {
+            'description': 'Gas for car',
+            'amount': Decimal('45.00'),
+            'days_ago': 3,
+            'category': 'Gas & Fuel',
+            'group': None,
+            'is_ai': True
+        },
+        {
+            'description': 'Lunch at Italian restaurant',
+            'amount': Decimal('32.75'),
+            'days_ago': 1,
+            'category': 'Dining Out',
+            'group': None,
+            'is_ai': True
+        },
+        {
+            'description': 'Movie tickets',
+            'amount': Decimal('28.00'),
+            'days_ago': 5,
+            'category': 'Entertainment',
+            'group': None,
+            'is_ai': False
+        },
+        {
+            'description': 'Morning coffee',
+            'amount': Decimal('5.50'),
+            'days_ago': 0,
+            'category': 'Coffee & Tea',
+            'group': None,
+            'is_ai': True
+        },
     
-    if created:
-        expense_count += 1
+        # Group expenses
+        {
+            'description': 'Tent for camping',
+            'amount': Decimal('299.99'),
+            'days_ago': 7,
+            'category': 'Shopping',
+            'group': 'Weekend Trip',
+            'is_ai': True
+        },
+        {
+            'description': 'Campsite reservation',
+            'amount': Decimal('75.00'),
+            'days_ago': 10,
+            'category': 'Travel',
+            'group': 'Weekend Trip',
+            'is_ai': False
+        },
+        {
+            'description': 'Team lunch buffet',
+            'amount': Decimal('180.00'),
+            'days_ago': 4,
+            'category': 'Dining Out',
+            'group': 'Office Team',
+            'is_ai': True
+        },
+        {
+            'description': 'Electricity bill',
+            'amount': Decimal('95.00'),
+            'days_ago': 15,
+            'category': 'Utilities',
+            'group': 'Roommates',
+            'is_ai': False
+        },
+        {
+            'description': 'Gym membership',
+            'amount': Decimal('49.99'),
+            'days_ago': 8,
+            'category': 'Health & Fitness',
+            'group': None,
+            'is_ai': False
+        },
+    ]
+
+    today = datetime.now().date()
+    existing_expenses = set(
+        Expense.objects.filter(paid_by=user).values_list('description', flat=True)
+    )
+    new_expenses_data = [
+        exp_data for exp_data in expenses_data
+        if exp_data['description'] not in existing_expenses
+    ]
+    Expense.objects.bulk_create([
+        Expense(
+            description=exp_data['description'],
+            amount=exp_data['amount'],
+            date=today - timedelta(days=exp_data['days_ago']),
+            category=categories.get(exp_data['category']),
+            group=groups.get(exp_data['group']) if exp_data['group'] else None,
+            paid_by=user,
+            is_ai_generated=exp_data['is_ai']
+        )
+        for exp_data in new_expenses_data
+    ])
+
+    expense_count = len(new_expenses_data)
+    for exp_data in new_expenses_data:
         group_str = f" [Group: {exp_data['group']}]" if exp_data['group'] else ""
         ai_str = " [AI]" if exp_data['is_ai'] else ""
         print(f"   ✅ {exp_data['description']}: ${exp_data['amount']}{group_str}{ai_str}")
@@ -212,6 +233,3 @@ print(f"   Username: {user.username}")
 print(f"   Password: demo123")
 print("\nVisit: http://127.0.0.1:8000")
 print("=" * 50)
-
-# Fix import
-from django.db import models
@@ -2,12 +2,14 @@
 Admin configuration for Expense Tracker models.
 """
 from django.contrib import admin
+from django.db.models import Count
 from .models import Category, Group, Expense
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'icon_name', 'user', 'created_at']
+    list_select_related = ['user']
     list_filter = ['user', 'created_at']
     search_fields = ['name', 'icon_name']
     ordering = ['name']
@@ -16,15 +18,22 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
     list_display = ['name', 'created_by', 'member_count', 'created_at']
+    list_select_related = ['created_by']
     list_filter = ['created_at']
     search_fields = ['name', 'description']
     filter_horizontal = ['members']
     ordering = ['-created_at']
+    
+    def get_queryset(self, request):
+        # Group.member_count() reads this annotation instead of querying per row
+        return super().get_queryset(request).annotate(_member_count=Count('members'))
 
 
 @admin.register(Expense)
 class ExpenseAdmin(admin.ModelAdmin):
     list_display = ['description', 'amount', 'date', 'category', 'group', 'paid_by', 'is_ai_generated', 'created_at']
+    # category__user: Category.__str__ renders the owner's username
+    list_select_related = ['category__user', 'group', 'paid_by']
     list_filter = ['date', 'category', 'group', 'is_ai_generated', 'paid_by']
     search_fields = ['description']
     date_hierarchy = 'date'
@@ -0,0 +1,55 @@
+"""
+Per-user cache keys and invalidation for Expense Tracker.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Groups/categories snapshot sent to Gemini with every chat message
+AI_CONTEXT_CACHE_TIMEOUT = 60
+
+# Category/group choices for the expense list filter dropdowns
+FILTER_OPTIONS_CACHE_TIMEOUT = 300
+
+
+def ai_context_key(user_id: int) -> str:
+    """Return the cache key for a user's groups/categories prompt context."""
+    return f"ai_ctx:{user_id}"
+
+
+def categories_key(user_id: int) -> str:
+    """Return the cache key for a user's category filter options."""
+    return f"user:{user_id}:categories"
+
+
+def groups_key(user_id: int) -> str:
+    """Return the cache key for a user's group filter options."""
+    return f"user:{user_id}:groups"
+
+
+def user_cache_keys(user_id: int) -> list:
+    """Return every per-user cache key holding category/group snapshots."""
+    return [ai_context_key(user_id), categories_key(user_id), groups_key(user_id)]
+
+
+def invalidate_user_cache(*user_ids: int) -> None:
+    """
+    Drop every cached category/group snapshot for the given users.
+    
+    The entries are deleted once the current transaction commits (or right
+    away outside one); deleting earlier would let a concurrent request refill
+    them from data that does not include the change yet.
+    """
+    if user_ids:
+        transaction.on_commit(lambda: _delete_user_cache(user_ids))
+
+
+def _delete_user_cache(user_ids) -> None:
+    """Delete cached entries, logging instead of failing on a cache outage."""
+    try:
+        cache.delete_many([key for user_id in user_ids for key in user_cache_keys(user_id)])
+    except Exception:
+        logger.warning("Failed to invalidate cache for users %s", user_ids, exc_info=True)
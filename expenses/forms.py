@@ -46,7 +46,8 @@ class ExpenseForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         if user:
             # Filter categories and groups to only show user's own
-            self.fields['category'].queryset = Category.objects.filter(user=user)
+            # (Category.__str__ renders the owner, so join it for the option labels)
+            self.fields['category'].queryset = Category.objects.filter(user=user).select_related('user')
             self.fields['group'].queryset = Group.objects.filter(members=user)
         
         # Make category and group optional
@@ -76,8 +77,9 @@ class CategoryForm(forms.ModelForm):
             'icon_name': 'Enter a Google Material Symbol name. <a href="https://fonts.google.com/icons" target="_blank">Browse icons</a>'
         }
     
-    # Common icon suggestions
-    ICON_SUGGESTIONS = [
+    # Common icon suggestions, in the order they are offered in the datalist.
+    # They are only hints; any Material Symbol name is accepted.
+    ICON_SUGGESTIONS_ORDERED = (
         'shopping_cart', 'restaurant', 'local_gas_station', 'flight',
         'hotel', 'medical_services', 'fitness_center', 'sports_tennis',
         'movie', 'music_note', 'book', 'school', 'computer', 'phone',
@@ -85,7 +87,7 @@ class CategoryForm(forms.ModelForm):
         'local_cafe', 'fastfood', 'directions_car', 'train', 'directions_bus',
         'local_taxi', 'two_wheeler', 'local_mall', 'checkroom', 'pets',
         'child_care', 'toys', 'celebration', 'cake', 'local_florist'
-    ]
+    )
 
 
 class GroupForm(forms.ModelForm):
@@ -132,23 +134,19 @@ class GroupForm(forms.ModelForm):
         if not usernames_str.strip():
             return []
         
-        usernames = [u.strip() for u in usernames_str.split(',') if u.strip()]
-        users = []
-        invalid_usernames = []
-        
-        for username in usernames:
-            try:
-                user = User.objects.get(username=username)
-                users.append(user)
-            except User.DoesNotExist:
-                invalid_usernames.append(username)
+        # Deduplicate while preserving the order the usernames were entered
+        usernames = list(dict.fromkeys(
+            u.strip() for u in usernames_str.split(',') if u.strip()
+        ))
+        found = User.objects.filter(username__in=usernames).in_bulk(field_name='username')
+        invalid_usernames = [u for u in usernames if u not in found]
         
         if invalid_usernames:
             raise forms.ValidationError(
                 f"These users do not exist: {', '.join(invalid_usernames)}"
             )
         
-        return users
+        return [found[u] for u in usernames]
 
 
 class ChatExpenseForm(forms.Form):
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['group', '-date'], name='expenses_ex_group_i_0f8f04_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['category', '-date'], name='expenses_ex_categor_bb2d1e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('is_ai_generated', True)), fields=['paid_by'], name='exp_ai_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:22
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0002_expense_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='expense',
+            name='receipt_image',
+            field=models.FileField(blank=True, help_text='Upload receipt image', null=True, upload_to='receipts/%Y/%m/', validators=[django.core.validators.FileExtensionValidator(['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'])]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:39
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0003_receipt_image_filefield'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='exp_ai_idx',
+        ),
+    ]
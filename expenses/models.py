@@ -1,9 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.validators import MinValueValidator
+from django.core.validators import FileExtensionValidator, MinValueValidator
 from decimal import Decimal
 
 
+RECEIPT_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp']
+
+
 class Category(models.Model):
     """
     Category model for expense categorization with Material Icon support.
@@ -43,11 +46,25 @@ class Group(models.Model):
         return self.name
     
     def total_expenses(self):
-        """Calculate total expenses for this group."""
-        return self.expenses.aggregate(total=models.Sum('amount'))['total'] or Decimal('0.00')
+        """
+        Calculate total expenses for this group.
+        Uses the `_total` annotation or prefetched expenses when available.
+        """
+        if hasattr(self, '_total'):
+            total = self._total
+        elif 'expenses' in getattr(self, '_prefetched_objects_cache', {}):
+            total = sum((e.amount for e in self.expenses.all()), Decimal('0.00'))
+        else:
+            total = self.expenses.aggregate(total=models.Sum('amount'))['total']
+        return total or Decimal('0.00')
     
     def member_count(self):
-        """Return the number of members in the group."""
+        """
+        Return the number of members in the group.
+        Uses the `_member_count` annotation when the queryset provides one.
+        """
+        if hasattr(self, '_member_count'):
+            return self._member_count
         return self.members.count()
 
 
@@ -79,10 +96,13 @@ class Expense(models.Model):
         help_text="Leave blank for personal expenses"
     )
     paid_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='expenses')
-    receipt_image = models.ImageField(
+    # FileField rather than ImageField: no dimensions are stored, so decoding
+    # every upload with Pillow is pure overhead. Extensions are still checked.
+    receipt_image = models.FileField(
         upload_to='receipts/%Y/%m/',
         blank=True,
         null=True,
+        validators=[FileExtensionValidator(RECEIPT_IMAGE_EXTENSIONS)],
         help_text="Upload receipt image"
     )
     is_ai_generated = models.BooleanField(
@@ -97,6 +117,8 @@ class Expense(models.Model):
         indexes = [
             models.Index(fields=['-date']),
             models.Index(fields=['paid_by', '-date']),
+            models.Index(fields=['group', '-date']),
+            models.Index(fields=['category', '-date']),
         ]
     
     def __str__(self):
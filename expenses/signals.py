@@ -0,0 +1,37 @@
+"""
+Signal handlers for Expense Tracker models.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Category, Group
+from .cache import invalidate_user_cache
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_owner_cache(sender, instance, **kwargs):
+    """Refresh cached category snapshots when a user's categories change."""
+    invalidate_user_cache(instance.user_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_members_cache(sender, instance, **kwargs):
+    """Refresh cached group snapshots for every member of a changed group."""
+    invalidate_user_cache(*instance.members.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Group.members.through)
+def invalidate_membership_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh cached group snapshots when group membership changes."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    
+    if reverse:
+        # Changed from the user side, e.g. user.expense_groups.add(...)
+        invalidate_user_cache(instance.pk)
+    elif action == 'pre_clear':
+        invalidate_user_cache(*instance.members.values_list('pk', flat=True))
+    else:
+        invalidate_user_cache(*pk_set)
@@ -1,3 +1,205 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from .cache import user_cache_keys
+from .models import Category, Expense, Group
+from .utils import process_chat_expense_input
+from .views import EXPENSE_PAGE_SIZE, parse_expense_cursor
+
+
+class ExpenseListPaginationTests(TestCase):
+    """Keyset pages must cover every expense once, even when dates tie."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('pager', password='pass')
+        shared_date = date(2026, 1, 15)
+        Expense.objects.bulk_create([
+            Expense(description=f'Same day {i}', amount=Decimal('1.00'),
+                    date=shared_date, paid_by=cls.user)
+            for i in range(EXPENSE_PAGE_SIZE * 2 + 10)
+        ] + [
+            Expense(description=f'Earlier {i}', amount=Decimal('1.00'),
+                    date=date(2026, 1, 1), paid_by=cls.user)
+            for i in range(5)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_pages_cover_every_expense_once(self):
+        expected = list(
+            Expense.objects.filter(paid_by=self.user)
+            .order_by('-date', '-id')
+            .values_list('id', flat=True)
+        )
+        url = reverse('expense_list')
+        seen = []
+        query = ''
+        while query is not None:
+            response = self.client.get(f'{url}?{query}')
+            page = response.context['expenses']
+            self.assertLessEqual(len(page), EXPENSE_PAGE_SIZE)
+            seen.extend(expense.id for expense in page)
+            query = response.context['next_query']
+        self.assertEqual(seen, expected)
+
+    def test_malformed_cursor_returns_first_page(self):
+        url = reverse('expense_list')
+        first_page = [e.id for e in self.client.get(url).context['expenses']]
+        for cursor in ('garbage', '2026-01-01_abc', '2026-13-01_5', '_'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([e.id for e in response.context['expenses']], first_page)
+
+    def test_parse_expense_cursor(self):
+        self.assertEqual(parse_expense_cursor('2026-01-15_42'), (date(2026, 1, 15), 42))
+        self.assertIsNone(parse_expense_cursor(None))
+        self.assertIsNone(parse_expense_cursor('garbage'))
+
+
+class CacheInvalidationTests(TestCase):
+    """Category/group writes clear the per-user caches but never depend on them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='pass')
+        cls.member = User.objects.create_user('member', password='pass')
+
+    def test_group_change_invalidates_members_in_one_call(self):
+        group = Group.objects.create(name='Trip', created_by=self.owner)
+        group.members.add(self.owner, self.member)
+        with mock.patch('expenses.cache.cache.delete_many') as delete_many, \
+                self.captureOnCommitCallbacks(execute=True):
+            group.save()
+        delete_many.assert_called_once()
+        self.assertCountEqual(
+            delete_many.call_args.args[0],
+            user_cache_keys(self.owner.pk) + user_cache_keys(self.member.pk)
+        )
+
+    def test_invalidation_waits_for_commit(self):
+        with mock.patch('expenses.cache.cache.delete_many') as delete_many:
+            with self.captureOnCommitCallbacks() as callbacks:
+                Category.objects.create(name='Travel', user=self.owner)
+            delete_many.assert_not_called()
+            for callback in callbacks:
+                callback()
+        delete_many.assert_called_once_with(user_cache_keys(self.owner.pk))
+
+    def test_expense_list_filters_reflect_new_category(self):
+        self.client.force_login(self.owner)
+        url = reverse('expense_list')
+        self.assertEqual(list(self.client.get(url).context['categories']), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Travel', user=self.owner)
+        names = [c['name'] for c in self.client.get(url).context['categories']]
+        self.assertEqual(names, ['Travel'])
+
+    def test_cache_outage_does_not_fail_writes(self):
+        self.client.force_login(self.owner)
+        with mock.patch('expenses.cache.cache.delete_many', side_effect=ConnectionError), \
+                self.assertLogs('expenses.cache', 'WARNING'), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('category_create'),
+                {'name': 'Books', 'icon_name': 'book'}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Category.objects.filter(user=self.owner, name='Books').exists())
+
+
+class ProcessChatExpenseInputTests(TestCase):
+    """Batched category/group resolution for AI-parsed chat input."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('chatter', password='pass')
+        cls.groceries = Category.objects.create(
+            name='Groceries', user=cls.user, icon_name='shopping_cart'
+        )
+        cls.trip = Group.objects.create(name='Weekend Trip', created_by=cls.user)
+        cls.trip.members.add(cls.user)
+        other = User.objects.create_user('outsider', password='pass')
+        Group.objects.create(name='Private Club', created_by=other).members.add(other)
+
+    def process(self, parsed_expenses):
+        with mock.patch('expenses.utils.parse_expense_with_gemini', return_value=parsed_expenses):
+            return process_chat_expense_input('ignored', self.user)
+
+    def test_existing_category_matches_case_insensitively(self):
+        expenses, _ = self.process([
+            {'amount': '12.50', 'description': 'Vegetables',
+             'category_name': 'groceries', 'group_name': 'weekend trip'},
+        ])
+        self.assertEqual(expenses[0].category, self.groceries)
+        self.assertEqual(expenses[0].group, self.trip)
+        self.assertEqual(Category.objects.filter(user=self.user).count(), 1)
+
+    def test_new_categories_are_created_once(self):
+        expenses, message = self.process([
+            {'amount': '40', 'description': 'Tent', 'category_name': 'Outdoor Gear',
+             'is_new_category': True, 'suggested_icon': 'camping'},
+            {'amount': '5', 'description': 'Rope', 'category_name': 'outdoor gear'},
+            {'amount': '3', 'description': 'Chips', 'category_name': 'Snacks'},
+        ])
+        gear = Category.objects.get(user=self.user, name='Outdoor Gear')
+        self.assertEqual(gear.icon_name, 'camping')
+        self.assertEqual([e.category for e in expenses[:2]], [gear, gear])
+        self.assertEqual(Category.objects.get(user=self.user, name='Snacks').icon_name, 'shopping_bag')
+        self.assertEqual(Category.objects.filter(user=self.user).count(), 3)
+        self.assertTrue(all(e.is_ai_generated and e.paid_by == self.user for e in expenses))
+        self.assertTrue(message.startswith('✅ Added 3 expenses'))
+
+    def test_concurrently_inserted_category_is_reused(self):
+        real_bulk_create = Category.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another request inserts the same category between lookup and insert
+            Category.objects.create(name='Outdoor Gear', user=self.user, icon_name='hiking')
+            return real_bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Category.objects, 'bulk_create', side_effect=racing_bulk_create):
+            expenses, _ = self.process([
+                {'amount': '40', 'description': 'Tent', 'category_name': 'Outdoor Gear',
+                 'is_new_category': True, 'suggested_icon': 'camping'},
+            ])
+        gear = Category.objects.get(user=self.user, name='Outdoor Gear')
+        self.assertEqual(gear.icon_name, 'hiking')
+        self.assertEqual(expenses[0].category, gear)
+
+    def test_unknown_or_foreign_group_is_left_empty(self):
+        expenses, _ = self.process([
+            {'amount': '9', 'description': 'Taxi', 'group_name': 'No Such Group'},
+            {'amount': '9', 'description': 'Dues', 'group_name': 'Private Club'},
+        ])
+        self.assertEqual([e.group for e in expenses], [None, None])
+        self.assertEqual([e.category for e in expenses], [None, None])
+        self.assertEqual(Expense.objects.filter(paid_by=self.user).count(), 2)
+
+
+class ChatExpenseViewTests(TestCase):
+    """HTMX chat posts return only the new exchange, in the page's markup."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('htmx', password='pass')
 
-# Create your tests here.
+    def test_htmx_post_renders_only_new_messages(self):
+        self.client.force_login(self.user)
+        parsed = [{'amount': '5', 'description': 'Coffee'}]
+        with mock.patch('expenses.utils.parse_expense_with_gemini', return_value=parsed):
+            for _ in range(3):
+                response = self.client.post(
+                    reverse('chat_expense'), {'message': 'coffee 5'}, HTTP_HX_REQUEST='true'
+                )
+        self.assertEqual(len(self.client.session['chat_history']), 6)
+        self.assertContains(response, 'class="msg-group user"', count=1)
+        self.assertContains(response, 'class="msg-group ai"', count=1)
+        self.assertContains(response, 'expense-card', count=1)
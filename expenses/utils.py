@@ -1,17 +1,22 @@
 """
 Utility functions for AI-powered expense parsing using Google Gemini API.
 """
-import json
 import logging
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
+import orjson
 from google import genai
 from google.genai import types
 from decouple import config
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Lower
 
+from .cache import AI_CONTEXT_CACHE_TIMEOUT, ai_context_key, invalidate_user_cache
 from .models import Category, Group, Expense
 
 # Configure logging
@@ -19,42 +24,8 @@ logger = logging.getLogger(__name__)
 
 # Configure Gemini API
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
-if GEMINI_API_KEY:
-    client = genai.Client(api_key=GEMINI_API_KEY)
 
-
-class ExpenseParseError(Exception):
-    """Custom exception for expense parsing errors."""
-    pass
-
-
-def get_gemini_client():
-    """Get configured Gemini client instance."""
-    if not GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY not configured in environment variables")
-    return client
-
-
-def build_expense_parsing_prompt(
-    user_input: str,
-    user_groups: List[Dict],
-    user_categories: List[Dict]
-) -> str:
-    """
-    Build a detailed prompt for Gemini to parse expense data.
-    
-    Args:
-        user_input: Natural language expense description
-        user_groups: List of user's existing groups [{"name": "Group Name"}, ...]
-        user_categories: List of user's existing categories [{"name": "Category", "icon": "icon_name"}, ...]
-    
-    Returns:
-        Formatted prompt string
-    """
-    groups_str = ", ".join([g['name'] for g in user_groups]) if user_groups else "No groups"
-    categories_str = ", ".join([f"{c['name']} ({c['icon']})" for c in user_categories]) if user_categories else "No categories"
-    
-    prompt = f"""You are an AI assistant helping to parse expense information from natural language.
+_PROMPT_TEMPLATE = """You are an AI assistant helping to parse expense information from natural language.
 
 User Input: "{user_input}"
 
@@ -103,8 +74,83 @@ Return ONLY a valid JSON object with this exact structure:
 }}
 
 Return ONLY the JSON, no additional text or explanations."""
+
+
+class ExpenseParseError(Exception):
+    """Custom exception for expense parsing errors."""
+    pass
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client():
+    """
+    Get configured Gemini client instance, created once on first use.
     
-    return prompt
+    The client owns a pooled keep-alive HTTP connection, so reusing the same
+    instance for every request amortizes TCP/TLS handshakes across chat turns.
+    Transient failures are retried by the SDK, which keeps its own SSL and
+    proxy configuration, instead of surfacing them as parse errors.
+    """
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY not configured in environment variables")
+    return genai.Client(
+        api_key=GEMINI_API_KEY,
+        http_options=types.HttpOptions(
+            retry_options=types.HttpRetryOptions(attempts=3)
+        )
+    )
+
+
+def get_ai_context(user: User) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Get the user's groups and categories in the shape expected by the prompt.
+    
+    The result is cached briefly and invalidated by signals whenever the
+    user's categories or group memberships change.
+    
+    Returns:
+        Tuple of (user_groups, user_categories)
+    """
+    def fetch():
+        # values() returns plain dicts, skipping model instance construction
+        user_groups = list(user.expense_groups.values('name'))
+        user_categories = [
+            {"name": cat['name'], "icon": cat['icon_name']}
+            for cat in user.categories.values('name', 'icon_name')
+        ]
+        return user_groups, user_categories
+    
+    return cache.get_or_set(
+        ai_context_key(user.id),
+        fetch,
+        AI_CONTEXT_CACHE_TIMEOUT
+    )
+
+
+def build_expense_parsing_prompt(
+    user_input: str,
+    user_groups: List[Dict],
+    user_categories: List[Dict]
+) -> str:
+    """
+    Build a detailed prompt for Gemini to parse expense data.
+    
+    Args:
+        user_input: Natural language expense description
+        user_groups: List of user's existing groups [{"name": "Group Name"}, ...]
+        user_categories: List of user's existing categories [{"name": "Category", "icon": "icon_name"}, ...]
+    
+    Returns:
+        Formatted prompt string
+    """
+    groups_str = ", ".join([g['name'] for g in user_groups]) if user_groups else "No groups"
+    categories_str = ", ".join([f"{c['name']} ({c['icon']})" for c in user_categories]) if user_categories else "No categories"
+    
+    return _PROMPT_TEMPLATE.format(
+        user_input=user_input,
+        groups_str=groups_str,
+        categories_str=categories_str
+    )
 
 
 def parse_expense_with_gemini(
@@ -126,15 +172,7 @@ def parse_expense_with_gemini(
     """
     try:
         # Get user's existing groups and categories
-        user_groups = [
-            {"name": group.name}
-            for group in user.expense_groups.all()
-        ]
-        
-        user_categories = [
-            {"name": cat.name, "icon": cat.icon_name}
-            for cat in user.categories.all()
-        ]
+        user_groups, user_categories = get_ai_context(user)
         
         # Build prompt
         prompt = build_expense_parsing_prompt(user_input, user_groups, user_categories)
@@ -146,28 +184,25 @@ def parse_expense_with_gemini(
             contents=prompt
         )
         
-        # Parse JSON response
+        # Parse JSON response, removing markdown code blocks if present
         response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
+        response_text = (
+            response_text
+            .removeprefix("```json")
+            .removeprefix("```")
+            .removesuffix("```")
+            .strip()
+        )
         
         # Parse JSON
-        parsed_data = json.loads(response_text)
+        parsed_data = orjson.loads(response_text)
         
         if 'expenses' not in parsed_data or not isinstance(parsed_data['expenses'], list):
             raise ExpenseParseError("Invalid response format from AI")
         
         return parsed_data['expenses']
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"JSON parsing error: {e}\nResponse: {response_text}")
         raise ExpenseParseError(f"Failed to parse AI response as JSON: {str(e)}")
     except Exception as e:
@@ -175,81 +210,119 @@ def parse_expense_with_gemini(
         raise ExpenseParseError(f"Failed to parse expense: {str(e)}")
 
 
-def create_expense_from_ai_data(
+def build_expense_from_ai_data(
     expense_data: Dict,
     user: User,
+    category: Optional[Category] = None,
+    group: Optional[Group] = None,
     date: Optional[datetime] = None
 ) -> Expense:
     """
-    Create an Expense object from AI-parsed data.
+    Build an unsaved Expense object from AI-parsed data.
     
     Args:
         expense_data: Dictionary with parsed expense information
         user: Django User instance
+        category: Already resolved Category, if any
+        group: Already resolved Group, if any
         date: Optional date for the expense (defaults to today)
     
     Returns:
-        Created Expense instance
+        Unsaved Expense instance
     """
-    # Extract data
-    amount = Decimal(str(expense_data.get('amount', '0')))
-    description = expense_data.get('description', 'Unnamed Expense')
-    category_name = expense_data.get('category_name')
-    group_name = expense_data.get('group_name')
-    is_new_category = expense_data.get('is_new_category', False)
-    suggested_icon = expense_data.get('suggested_icon', 'shopping_bag')
-    
     if date is None:
         date = datetime.now().date()
     
-    # Handle category
-    category = None
-    if category_name:
-        if is_new_category:
-            # Create new category with AI-suggested icon
-            category, created = Category.objects.get_or_create(
-                name=category_name,
-                user=user,
-                defaults={'icon_name': suggested_icon or 'category'}
-            )
-            if created:
-                logger.info(f"Created new category: {category_name} with icon: {suggested_icon}")
-        else:
-            # Try to find existing category (case-insensitive)
-            category = Category.objects.filter(
-                name__iexact=category_name,
-                user=user
-            ).first()
-            
-            if not category:
-                # Create it anyway if not found
-                category = Category.objects.create(
-                    name=category_name,
-                    user=user,
-                    icon_name=suggested_icon or 'category'
-                )
-    
-    # Handle group
-    group = None
-    if group_name:
-        group = Group.objects.filter(
-            name__iexact=group_name,
-            members=user
-        ).first()
-    
-    # Create expense
-    expense = Expense.objects.create(
-        description=description,
-        amount=amount,
+    return Expense(
+        description=expense_data.get('description', 'Unnamed Expense'),
+        amount=Decimal(str(expense_data.get('amount', '0'))),
         date=date,
         category=category,
         group=group,
         paid_by=user,
         is_ai_generated=True
     )
+
+
+def resolve_ai_categories(parsed_expenses: List[Dict], user: User) -> Dict[str, Category]:
+    """
+    Look up (and create if missing) every category named in the parsed expenses.
+    
+    Existing categories are matched case-insensitively with a single query and
+    all missing ones are inserted with a single bulk insert.
+    
+    Args:
+        parsed_expenses: List of parsed expense dictionaries
+        user: Django User instance
     
-    logger.info(f"Created AI expense: {expense}")
-    return expense
+    Returns:
+        Dictionary mapping lowercased category name to Category
+    """
+    # First occurrence of each name decides the icon for a new category
+    requested = {}
+    for expense_data in parsed_expenses:
+        category_name = expense_data.get('category_name')
+        if category_name:
+            requested.setdefault(
+                category_name.lower(),
+                (category_name, expense_data.get('suggested_icon', 'shopping_bag') or 'category')
+            )
+    
+    if not requested:
+        return {}
+    
+    categories = {}
+    for category in Category.objects.annotate(
+        lower_name=Lower('name')
+    ).filter(user=user, lower_name__in=requested):
+        categories.setdefault(category.lower_name, category)
+    
+    missing = [
+        Category(name=name, user=user, icon_name=icon)
+        for key, (name, icon) in requested.items()
+        if key not in categories
+    ]
+    if missing:
+        Category.objects.bulk_create(missing, ignore_conflicts=True)
+        # bulk_create skips post_save, so refresh the user's cached snapshots here
+        invalidate_user_cache(user.id)
+        for category in Category.objects.filter(
+            user=user,
+            name__in=[c.name for c in missing]
+        ):
+            categories.setdefault(category.name.lower(), category)
+            logger.info(f"Created new category: {category.name} with icon: {category.icon_name}")
+    
+    return categories
+
+
+def resolve_ai_groups(parsed_expenses: List[Dict], user: User) -> Dict[str, Group]:
+    """
+    Look up every group named in the parsed expenses with a single query.
+    
+    Args:
+        parsed_expenses: List of parsed expense dictionaries
+        user: Django User instance
+    
+    Returns:
+        Dictionary mapping lowercased group name to Group
+    """
+    group_names = {
+        expense_data['group_name'].lower()
+        for expense_data in parsed_expenses
+        if expense_data.get('group_name')
+    }
+    
+    if not group_names:
+        return {}
+    
+    groups = {}
+    for group in Group.objects.annotate(
+        lower_name=Lower('name')
+    ).filter(members=user, lower_name__in=group_names):
+        groups.setdefault(group.lower_name, group)
+    
+    return groups
 
 
 def process_chat_expense_input(user_input: str, user: User) -> Tuple[List[Expense], str]:
@@ -261,7 +334,8 @@ def process_chat_expense_input(user_input: str, user: User) -> Tuple[List[Expens
         user: Django User instance
     
     Returns:
-        Tuple of (list of created Expense objects, success message)
+        Tuple of (list of created Expense objects, with their category and
+        group instances already attached, success message)
     
     Raises:
         ExpenseParseError: If processing fails
@@ -272,11 +346,27 @@ def process_chat_expense_input(user_input: str, user: User) -> Tuple[List[Expens
     if not parsed_expenses:
         raise ExpenseParseError("No expenses found in the input")
     
-    # Create expense objects
-    created_expenses = []
-    for expense_data in parsed_expenses:
-        expense = create_expense_from_ai_data(expense_data, user)
-        created_expenses.append(expense)
+    # Commit all inserts together; the Gemini call above stays outside the
+    # transaction so no connection is held open across the network round-trip
+    with transaction.atomic():
+        # Resolve all categories and groups up front instead of per expense
+        categories = resolve_ai_categories(parsed_expenses, user)
+        groups = resolve_ai_groups(parsed_expenses, user)
+        
+        # Create expense objects
+        today = datetime.now().date()
+        created_expenses = Expense.objects.bulk_create([
+            build_expense_from_ai_data(
+                expense_data,
+                user,
+                category=categories.get((expense_data.get('category_name') or '').lower()),
+                group=groups.get((expense_data.get('group_name') or '').lower()),
+                date=today
+            )
+            for expense_data in parsed_expenses
+        ], batch_size=500)
+    for expense in created_expenses:
+        logger.info(f"Created AI expense: {expense}")
     
     # Build success message
     if len(created_expenses) == 1:
@@ -287,11 +377,12 @@ def process_chat_expense_input(user_input: str, user: User) -> Tuple[List[Expens
         if exp.group:
             message += f" [Group: {exp.group.name}]"
     else:
-        message = f"✅ Added {len(created_expenses)} expenses:\n"
+        lines = [f"✅ Added {len(created_expenses)} expenses:"]
         for exp in created_expenses:
-            message += f"• {exp.description} - ${exp.amount}"
+            line = f"• {exp.description} - ${exp.amount}"
             if exp.category:
-                message += f" [{exp.category.name}]"
-            message += "\n"
+                line += f" [{exp.category.name}]"
+            lines.append(line)
+        message = "\n".join(lines)
     
     return created_expenses, message
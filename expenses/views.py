@@ -3,35 +3,59 @@ Views for Expense Tracker application.
 """
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
 from django.contrib import messages
-from django.db.models import Sum, Count, Q
+from django.core.cache import cache
+from django.db.models import Sum, Count, Prefetch, Q
 from django.http import JsonResponse
-from datetime import datetime, timedelta
+from django.utils import timezone
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from typing import Optional, Tuple
 
+from .cache import FILTER_OPTIONS_CACHE_TIMEOUT, categories_key, groups_key
 from .models import Expense, Category, Group
 from .forms import ExpenseForm, CategoryForm, GroupForm, ChatExpenseForm
 from .utils import process_chat_expense_input, ExpenseParseError
 
+# Number of expenses shown per page of the expense list
+EXPENSE_PAGE_SIZE = 50
+
+# Number of chat messages kept in the session
+CHAT_HISTORY_LIMIT = 50
+
+# Icon datalist for the category form, resolved once at import
+ICON_SUGGESTIONS_ORDERED = CategoryForm.ICON_SUGGESTIONS_ORDERED
+
 
 @login_required
 def dashboard(request):
     """Main dashboard view with expense summary."""
     user = request.user
     
-    # Get date range (last 30 days by default)
-    end_date = datetime.now().date()
+    # Get date range (last 30 days by default), by calendar day in the
+    # active time zone so the query parameters are stable for the whole day
+    end_date = timezone.localdate()
     start_date = end_date - timedelta(days=30)
     
     # Get user's expenses
     expenses = Expense.objects.filter(paid_by=user).select_related('category', 'group')
-    recent_expenses = expenses[:10]
-    
-    # Calculate statistics
-    total_expenses = expenses.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-    monthly_expenses = expenses.filter(
-        date__gte=start_date
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+    # Only load the columns the dashboard renders for recent expenses. The
+    # (paid_by, -date) index serves this as a top-N scan; evaluating it once
+    # here keeps the template from re-running the LIMIT query.
+    recent_expenses = list(expenses.only(
+        'id', 'description', 'amount', 'date', 'is_ai_generated',
+        'category__name', 'category__icon_name', 'group__name'
+    ).order_by('-date', '-created_at')[:10])
+    
+    # Calculate statistics in a single aggregate query
+    totals = expenses.aggregate(
+        total=Sum('amount'),
+        monthly=Sum('amount', filter=Q(date__gte=start_date)),
+        count=Count('id')
+    )
+    total_expenses = totals['total'] or Decimal('0.00')
+    monthly_expenses = totals['monthly'] or Decimal('0.00')
     
     # Category breakdown
     category_breakdown = expenses.values(
@@ -55,7 +79,7 @@ def dashboard(request):
         'recent_expenses': recent_expenses,
         'category_breakdown': category_breakdown,
         'group_expenses': group_expenses,
-        'expense_count': expenses.count(),
+        'expense_count': totals['count'],
     }
     
     return render(request, 'expenses/dashboard.html', context)
@@ -71,12 +95,16 @@ def chat_expense(request):
         form = ChatExpenseForm(request.POST)
         if form.is_valid():
             user_message = form.cleaned_data['message']
+            # One timestamp shared by every message added in this request
+            timestamp = datetime.now().isoformat()
+            # Index of the first message added by this request
+            first_new = len(chat_history)
             
             # Add user message to history
             chat_history.append({
                 'type': 'user',
                 'message': user_message,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             })
             
             try:
@@ -86,11 +114,13 @@ def chat_expense(request):
                     request.user
                 )
                 
-                # Add success response to history
+                # Add success response to history. The expenses come back with
+                # category/group instances attached, so serializing them here
+                # issues no further queries.
                 chat_history.append({
                     'type': 'system',
                     'message': success_message,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': timestamp,
                     'expenses': [
                         {
                             'id': exp.id,
@@ -111,18 +141,24 @@ def chat_expense(request):
                 chat_history.append({
                     'type': 'system',
                     'message': error_message,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': timestamp,
                     'is_error': True
                 })
                 messages.error(request, str(e))
             
-            # Save chat history to session (keep last 50 messages)
-            request.session['chat_history'] = chat_history[-50:]
+            new_messages = chat_history[first_new:]
             
-            # For HTMX requests, return partial template
+            # Save chat history to session (keep last 50 messages), trimming
+            # the list in place instead of storing a sliced copy
+            if len(chat_history) > CHAT_HISTORY_LIMIT:
+                del chat_history[:-CHAT_HISTORY_LIMIT]
+            request.session['chat_history'] = chat_history
+            
+            # For HTMX requests, return only this exchange; the page appends
+            # it to the messages already on screen
             if request.headers.get('HX-Request'):
                 return render(request, 'expenses/partials/chat_messages.html', {
-                    'chat_history': chat_history
+                    'chat_history': new_messages
                 })
             
             # Regular request - redirect to avoid form resubmission
@@ -145,6 +181,17 @@ def clear_chat(request):
     return redirect('chat_expense')
 
 
+def parse_expense_cursor(cursor: Optional[str]) -> Optional[Tuple[date, int]]:
+    """Parse an expense list cursor of the form '<YYYY-MM-DD>_<id>'."""
+    if not cursor:
+        return None
+    try:
+        cursor_date, cursor_id = cursor.split('_', 1)
+        return date.fromisoformat(cursor_date), int(cursor_id)
+    except ValueError:
+        return None
+
+
 @login_required
 def expense_list(request):
     """List all expenses with filtering options."""
@@ -168,9 +215,41 @@ def expense_list(request):
     if end_date:
         expenses = expenses.filter(date__lte=end_date)
     
-    # Get filter options
-    categories = Category.objects.filter(user=request.user)
-    groups = Group.objects.filter(members=request.user)
+    # Keyset pagination: fetch one extra row to detect a next page without COUNT(*)
+    expenses = expenses.order_by('-date', '-id')
+    cursor = parse_expense_cursor(request.GET.get('cursor'))
+    if cursor:
+        cursor_date, cursor_id = cursor
+        expenses = expenses.filter(
+            Q(date__lt=cursor_date) | Q(date=cursor_date, id__lt=cursor_id)
+        )
+    expenses = list(expenses[:EXPENSE_PAGE_SIZE + 1])
+    has_next = len(expenses) > EXPENSE_PAGE_SIZE
+    del expenses[EXPENSE_PAGE_SIZE:]
+    
+    next_query = None
+    if has_next:
+        params = request.GET.copy()
+        params['cursor'] = f"{expenses[-1].date.isoformat()}_{expenses[-1].id}"
+        next_query = params.urlencode()
+    
+    first_query = None
+    if cursor:
+        params = request.GET.copy()
+        params.pop('cursor')
+        first_query = params.urlencode()
+    
+    # Get filter options (cached per user, invalidated by signals on change)
+    categories = cache.get_or_set(
+        categories_key(request.user.id),
+        lambda: list(Category.objects.filter(user=request.user).values('id', 'name', 'icon_name')),
+        FILTER_OPTIONS_CACHE_TIMEOUT
+    )
+    groups = cache.get_or_set(
+        groups_key(request.user.id),
+        lambda: list(Group.objects.filter(members=request.user).values('id', 'name')),
+        FILTER_OPTIONS_CACHE_TIMEOUT
+    )
     
     context = {
         'expenses': expenses,
@@ -178,6 +257,8 @@ def expense_list(request):
         'groups': groups,
         'selected_category': category_id,
         'selected_group': group_id,
+        'next_query': next_query,
+        'first_query': first_query,
     }
     
     return render(request, 'expenses/expense_list.html', context)
@@ -238,7 +319,10 @@ def expense_delete(request, pk):
 @login_required
 def category_list(request):
     """List all user categories."""
-    categories = Category.objects.filter(user=request.user).annotate(
+    # Only the rendered columns are selected, which also keeps the GROUP BY narrow
+    categories = Category.objects.filter(user=request.user).only(
+        'id', 'name', 'icon_name'
+    ).annotate(
         expense_count=Count('expenses'),
         total_amount=Sum('expenses__amount')
     )
@@ -261,7 +345,7 @@ def category_create(request):
     else:
         form = CategoryForm()
     
-    context = {'form': form, 'title': 'Create Category', 'icon_suggestions': CategoryForm.ICON_SUGGESTIONS}
+    context = {'form': form, 'title': 'Create Category', 'icon_suggestions': ICON_SUGGESTIONS_ORDERED}
     return render(request, 'expenses/category_form.html', context)
 
 
@@ -279,7 +363,7 @@ def category_update(request, pk):
     else:
         form = CategoryForm(instance=category)
     
-    context = {'form': form, 'title': 'Edit Category', 'category': category, 'icon_suggestions': CategoryForm.ICON_SUGGESTIONS}
+    context = {'form': form, 'title': 'Edit Category', 'category': category, 'icon_suggestions': ICON_SUGGESTIONS_ORDERED}
     return render(request, 'expenses/category_form.html', context)
 
 
@@ -301,10 +385,14 @@ def category_delete(request, pk):
 @login_required
 def group_list(request):
     """List all user groups."""
+    # Members are prefetched for the avatar stack (which also serves the member
+    # count), loading only what the template renders
     groups = Group.objects.filter(members=request.user).annotate(
         expense_count=Count('expenses'),
-        total_amount=Sum('expenses__amount')
-    ).prefetch_related('members')
+        _total=Sum('expenses__amount')
+    ).prefetch_related(
+        Prefetch('members', queryset=User.objects.only('id', 'username'))
+    )
     
     context = {'groups': groups}
     return render(request, 'expenses/group_list.html', context)
@@ -320,10 +408,8 @@ def group_create(request):
             group.created_by = request.user
             group.save()
             
-            # Add creator and specified members
-            group.members.add(request.user)
-            for user in form.cleaned_data['members_usernames']:
-                group.members.add(user)
+            # Add creator and specified members in a single insert
+            group.members.add(request.user, *form.cleaned_data['members_usernames'])
             
             messages.success(request, f'Group "{group.name}" created successfully!')
             return redirect('group_list')
@@ -344,11 +430,8 @@ def group_update(request, pk):
         if form.is_valid():
             form.save()
             
-            # Update members
-            group.members.clear()
-            group.members.add(request.user)
-            for user in form.cleaned_data['members_usernames']:
-                group.members.add(user)
+            # Update members, only inserting/deleting the rows that changed
+            group.members.set([request.user, *form.cleaned_data['members_usernames']])
             
             messages.success(request, f'Group "{group.name}" updated successfully!')
             return redirect('group_list')
@@ -377,23 +460,36 @@ def group_delete(request, pk):
 @login_required
 def group_detail(request, pk):
     """View group details and expenses."""
-    group = get_object_or_404(Group, pk=pk, members=request.user)
-    expenses = group.expenses.all().select_related('paid_by', 'category')
-    
-    # Calculate per-member statistics
-    member_stats = []
-    for member in group.members.all():
-        member_expenses = expenses.filter(paid_by=member)
-        member_stats.append({
+    # Members (annotated with their per-group statistics, aggregated in the
+    # database) and expenses are prefetched so the template hits no lazy loads
+    in_group = Q(expenses__group_id=pk)
+    group = get_object_or_404(
+        Group.objects.select_related('created_by').prefetch_related(
+            Prefetch('members', queryset=User.objects.annotate(
+                total=Sum('expenses__amount', filter=in_group),
+                count=Count('expenses', filter=in_group)
+            )),
+            Prefetch('expenses', queryset=Expense.objects.select_related('paid_by', 'category'))
+        ),
+        pk=pk,
+        members=request.user
+    )
+    expenses = list(group.expenses.all())
+    
+    member_stats = [
+        {
             'user': member,
-            'total': member_expenses.aggregate(Sum('amount'))['amount__sum'] or Decimal('0.00'),
-            'count': member_expenses.count()
-        })
+            'total': member.total or Decimal('0.00'),
+            'count': member.count
+        }
+        for member in group.members.all()
+    ]
     
     context = {
         'group': group,
         'expenses': expenses,
         'member_stats': member_stats,
+        # Served from the prefetched expenses, so no extra aggregate query
         'total_expenses': group.total_expenses()
     }
     